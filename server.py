@@ -3,6 +3,7 @@
 # dependencies = [
 #     "mcp",
 #     "uvicorn",
+#     "uvloop; sys_platform != 'win32'",
 #     "pyvamdc @ git+https://github.com/VAMDC/pyVAMDC.git"
 # ]
 # ///
@@ -10,83 +11,452 @@
 
 import argparse
 import asyncio
-from typing import Any
+import math
+import os
+import pickle
+import re
+import signal
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from itertools import repeat
+from pathlib import Path
+
+from mcp.server.fastmcp import Context, FastMCP
 
-import httpx
-import uvicorn
+from typing import List, Optional, Dict, Any
 
-from mcp.server.fastmcp import FastMCP
+mcp = FastMCP(name="vamdc", json_response=True, stateless_http=True)
 
-import pyVAMDC.spectral.species as species
-import pyVAMDC.spectral.filters as filters
-import pyVAMDC.spectral.lines as lines
+# Static payload of get_server_info, built once at import. The same object is returned on
+# every call: FastMCP only serializes it, nothing may modify it.
+SERVER_INFO = {
+    "server_name": "VAMDC MCP Server",
+    "version": "1.0.0",
+    "available_tools": ["get_server_info", "get_nodes", "get_species", "get_species_by_node", "get_lines"],
+    "description": "Server for accessing VAMDC spectroscopic databases",
+    "endpoints": {
+        "server_info": "Get server information and capabilities",
+        "species": "Get all available chemical species",
+        "nodes": "Get all available database nodes",
+        "species_by_node": "Get chemical species from a specific database node",
+        "lines": "Get spectral lines within wavelength range"
+    }
+}
 
-from typing import List, Optional, Dict, Any
+# Number of seconds the species/nodes metadata is reused before being fetched again
+SPECIES_CACHE_TTL = 300.0
 
-mcp = FastMCP(name="vamdc", json_response=True, stateless_http=True)
+# Default size of the worker pool running the per-node spectral line queries,
+# large enough for a query to reach every VAMDC node (~30) at once
+DEFAULT_THREADS = 32
+
+# Worker pool for the short blocking work (filtering, rendering, record building), kept
+# separate from the event loop's default executor
+EXECUTOR = ThreadPoolExecutor(thread_name_prefix="vamdc-io")
+
+# Worker pool for the per-node spectral line queries, which may each take minutes. Kept apart
+# from EXECUTOR so that a few large get_lines calls do not hold up the other tools.
+NODE_EXECUTOR = ThreadPoolExecutor(max_workers=DEFAULT_THREADS, thread_name_prefix="vamdc-node")
+
+# Copy of the species/nodes metadata kept across restarts
+SPECIES_CACHE_FILE = Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache")) / "vamdc-mcp" / "species.pickle"
+
+# Seconds after which a temporary copy left behind by a server stopped mid-save is removed
+SPECIES_CACHE_LEFTOVER_AGE = 3600.0
+
+_species_cache_lock = asyncio.Lock()
+_species_cache = {"value": None, "tap_index": None, "species_cells": None, "version": 0, "expires": 0.0}
 
-def getSpecies():
+# Renderings of the cached species/nodes data, as name -> (cache version, rendering)
+_rendered_tables = {}
+
+
+def _fetch_all_species(use_disk_cache):
     """
-    Gets all the chemical information available on the Species Database. 
-    Returns two Pandas dataframe. One for the inforamtion regarding the Nodes, the other for the information regarding the chemical species within the Nodes. 
+    Fetches the (species, nodes) dataframes from the Species Database, along with
+    an index mapping each node TAP endpoint to the row positions of its species
+    and the escaped markdown cells of every species.
+
+    Args:
+        use_disk_cache (bool): Whether a copy saved on disk by a previous run, younger
+            than SPECIES_CACHE_TTL, may be loaded instead of querying the Species Database
+
+    Returns:
+        tuple: ((species, nodes), tap_index, species_cells, age), age being how many
+        seconds old the data already is
     """
-    species_dataframe , _ = species.getAllSpecies()
-    return species_dataframe.to_dict(orient='records')
+    dataframes, age = _load_species_from_disk() if use_disk_cache else (None, 0.0)
+
+    if dataframes is None:
+        # Imported on first use: pyVAMDC pulls in pandas, which would otherwise delay startup
+        import pyVAMDC.spectral.species as species
+
+        dataframes = species.getAllSpecies()
+        _save_species_to_disk(dataframes)
 
+    species_dataframe, _ = dataframes
+    tap_index = species_dataframe.groupby('tapEndpoint', sort=False).indices
+    species_cells = _species_table_cells(species_dataframe)
+    return dataframes, tap_index, species_cells, age
 
-def getNodes():
+
+def _load_species_from_disk():
     """
-    Gets all the Nodes available on the Species Database.
-    Returns a Pandas dataframe with information regarding the Nodes.
+    Loads the (species, nodes) dataframes saved by a previous run, if younger than
+    SPECIES_CACHE_TTL. Returns them with their age in seconds, or (None, 0.0).
     """
-    _, nodes_dataframe = species.getAllSpecies()
-    return nodes_dataframe.to_dict(orient='records')
+    try:
+        with SPECIES_CACHE_FILE.open('rb') as cache_file:
+            status = os.fstat(cache_file.fileno())
+            # Unpickling can run code: only trust a copy owned by this user and writable by
+            # nobody else (ownership cannot be checked on Windows)
+            if hasattr(os, 'getuid') and (status.st_uid != os.getuid() or status.st_mode & 0o022):
+                return None, 0.0
+            age = time.time() - status.st_mtime
+            if age >= SPECIES_CACHE_TTL:
+                return None, 0.0
+            return pickle.load(cache_file), age
+    except Exception:
+        # Missing, unreadable or incompatible copies are simply refetched
+        return None, 0.0
+
+
+def _save_species_to_disk(dataframes):
+    """
+    Saves the (species, nodes) dataframes for the next server start. Failures are
+    ignored, the on-disk copy is only an optimisation.
+    """
+    temporary_name = None
+    try:
+        SPECIES_CACHE_FILE.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+
+        # Remove the temporary copies of saves that never completed (the save runs in a
+        # daemon thread, which is stopped wherever it is when the server exits)
+        now = time.time()
+        for leftover in SPECIES_CACHE_FILE.parent.glob('species.*.tmp'):
+            try:
+                if now - leftover.stat().st_mtime > SPECIES_CACHE_LEFTOVER_AGE:
+                    leftover.unlink()
+            except OSError:
+                pass
+
+        # A temporary file of its own, so servers starting together never write into the same one
+        with tempfile.NamedTemporaryFile(
+            dir=SPECIES_CACHE_FILE.parent, prefix='species.', suffix='.tmp', delete=False
+        ) as cache_file:
+            temporary_name = cache_file.name
+            pickle.dump(dataframes, cache_file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporary_name, SPECIES_CACHE_FILE)
+    except Exception:
+        # Unwritable directories and unpicklable data alike leave the copy as it was
+        if temporary_name is not None:
+            try:
+                os.unlink(temporary_name)
+            except OSError:
+                pass
+
+
+def _run_in_daemon_thread(function, *args):
+    """
+    Runs function(*args) in a daemon thread and returns a future of its result.
+    Unlike the worker pools' threads, it is not waited for at interpreter exit, so
+    a metadata fetch still running then does not hold up shutdown.
+    """
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+
+    def settle(result, error):
+        # The awaiting caller may have been cancelled in the meantime
+        if future.done():
+            return
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    def run():
+        try:
+            result, error = function(*args), None
+        except Exception as exception:
+            result, error = None, exception
+        try:
+            loop.call_soon_threadsafe(settle, result, error)
+        except RuntimeError:
+            # The event loop is already closed, nobody is waiting for the result
+            pass
+
+    threading.Thread(target=run, name="vamdc-species", daemon=True).start()
+    return future
+
+
+async def _get_all_species_cached():
+    """
+    Returns the (species, nodes) dataframes from the Species Database, reusing
+    the last fetched pair until SPECIES_CACHE_TTL seconds have elapsed.
+    Concurrent callers during a refresh wait for that single fetch.
+    """
+    if _species_cache["value"] is not None and time.monotonic() < _species_cache["expires"]:
+        return _species_cache["value"]
+
+    async with _species_cache_lock:
+        # Another caller may have refreshed the cache while we were waiting for the lock
+        if _species_cache["value"] is None or time.monotonic() >= _species_cache["expires"]:
+            # Only a cold start may reuse the copy on disk, refreshes always refetch
+            use_disk_cache = _species_cache["value"] is None
+            (
+                _species_cache["value"],
+                _species_cache["tap_index"],
+                _species_cache["species_cells"],
+                age
+            ) = await _run_in_daemon_thread(_fetch_all_species, use_disk_cache)
+            _species_cache["version"] += 1
+            _species_cache["expires"] = time.monotonic() + SPECIES_CACHE_TTL - age
+        return _species_cache["value"]
+
+
+async def _warm_species_cache():
+    """
+    Fills the species cache ahead of the first tool call. Failures are only reported,
+    the tools fetch the data again on demand.
+    """
+    try:
+        await _get_all_species_cached()
+    except Exception as error:
+        print(f"Could not prefetch the VAMDC species metadata: {error}", file=sys.stderr, flush=True)
+
+
+def _invalidate_species_cache(*_):
+    """
+    Drops the cached species/nodes dataframes so the next lookup refetches them.
+    Also used as the SIGHUP handler.
+    """
+    _species_cache["expires"] = 0.0
+
+
+def _shutdown_executors():
+    """
+    Drops the work still queued in the worker pools once the transport has stopped, so
+    it is not started during interpreter shutdown. Work already running is waited for.
+    """
+    for executor in (EXECUTOR, NODE_EXECUTOR):
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+# Translation table escaping pipe characters inside markdown table cells
+_PIPE_TABLE = str.maketrans({'|': '\\|'})
+
 
-def format_species_as_markdown_table(species_list: List[Dict[str, Any]]) -> str:
+def _markdown_row(values) -> str:
     """
-    Formats a list of species dictionaries as a markdown table.
+    Joins already escaped cell strings into a markdown table row.
+    """
+    return '| ' + ' | '.join(values) + ' |'
+
+
+# Node columns rendered in the markdown tables, with their headers, in display order
+NODE_TABLE_COLUMNS = {
+    'shortName': 'Short Name',
+    'tapEndpoint': 'TAP Endpoint',
+    'topics': 'Topics'
+}
+
+# Species columns rendered in the markdown tables, in display order
+SPECIES_TABLE_COLUMNS = [
+    'name',
+    'stoichiometricFormula',
+    'InChIKey',
+    'speciesType',
+    'charge',
+    'massNumber',
+    'structuralFormula',
+    'shortName',
+    '# unique atoms',
+    '# total atoms',
+    'computed charge',
+    'computed mol_weight'
+]
+
+
+def format_species_as_markdown_table(df) -> str:
+    """
+    Formats a species dataframe as a markdown table.
 
     Args:
-        species_list: List of species dictionaries
+        df: Dataframe of chemical species
 
     Returns:
         Markdown-formatted table string
     """
-    # Define columns to include
-    columns = [
-        'name',
-        'stoichiometricFormula',
-        'InChIKey',
-        'speciesType',
-        'charge',
-        'massNumber',
-        'structuralFormula',
-        'shortName',
-        '# unique atoms',
-        '# total atoms',
-        'computed charge',
-        'computed mol_weight'
+    return _species_table_from_cells(_species_table_cells(df))
+
+
+def _species_table_cells(df):
+    """
+    Converts every cell of the species table columns to an escaped string, column by
+    column (missing columns render empty).
+
+    Args:
+        df: Dataframe of chemical species
+
+    Returns:
+        list: One array of cell strings per column of SPECIES_TABLE_COLUMNS
+    """
+    table = df.reindex(columns=SPECIES_TABLE_COLUMNS, fill_value='')
+    # str() of every value, as the row-wise rendering did: missing values render as
+    # None/nan, whereas astype(str) leaves them as NaN on pandas 3
+    return [
+        table[col].astype(object).map(str).str.translate(_PIPE_TABLE).to_numpy()
+        for col in SPECIES_TABLE_COLUMNS
     ]
 
-    # Build markdown table
-    header = '| ' + ' | '.join(columns) + ' |'
+
+def _species_table_from_cells(cells, columns=SPECIES_TABLE_COLUMNS) -> str:
+    """
+    Builds the species markdown table from the column arrays of _species_table_cells,
+    or from a selection of them whose names are given in columns.
+    """
+    header = _markdown_row(columns)
     separator = '|' + '|'.join(['---' for _ in columns]) + '|'
 
-    table_lines = [header, separator]
+    return '\n'.join([header, separator, *map(_markdown_row, zip(*cells))])
+
 
-    for species_dict in species_list:
-        row_values = []
-        for col in columns:
-            value = species_dict.get(col, '')
-            # Convert to string and escape pipe characters
-            value_str = str(value).replace('|', '\\|')
-            row_values.append(value_str)
+def format_nodes_as_markdown_table(nodes_list: List[Dict[str, Any]], fields: Optional[List[str]] = None) -> str:
+    """
+    Formats a list of node dictionaries as a markdown table.
 
-        table_lines.append('| ' + ' | '.join(row_values) + ' |')
+    Args:
+        nodes_list: List of node dictionaries
+        fields: Node columns to include, among the keys of NODE_TABLE_COLUMNS (default: all of them)
 
-    return '\n'.join(table_lines)
+    Returns:
+        Markdown-formatted table string
+    """
+    if fields is None:
+        fields = list(NODE_TABLE_COLUMNS)
 
-async def getLines(lambda_min, lambda_max, listNodes=None, listSpecies=None):
+    # Build markdown table
+    table_lines = [
+        _markdown_row(NODE_TABLE_COLUMNS[field] for field in fields),
+        '|' + '|'.join('-' * (len(NODE_TABLE_COLUMNS[field]) + 2) for field in fields) + '|'
+    ]
+
+    for node in nodes_list:
+        cells = {
+            'shortName': node.get('shortName', ''),
+            'tapEndpoint': node.get('tapEndpoint', ''),
+            'topics': ', '.join(node.get('topics', []))
+        }
+
+        # Escape pipe characters in cell content
+        table_lines.append(_markdown_row(cells[field].translate(_PIPE_TABLE) for field in fields))
+
+    return "\n".join(table_lines)
+
+
+def _check_fields(fields, available):
+    """
+    Raises a ValueError naming the valid choices if no field is requested or any of
+    the requested fields is unknown.
+    """
+    if not fields:
+        raise ValueError(f"No fields requested, available fields are: {', '.join(available)}")
+    unknown = [field for field in fields if field not in available]
+    if unknown:
+        raise ValueError(f"Unknown fields {unknown}, available fields are: {', '.join(available)}")
+
+
+async def _render_cached(name, render):
+    """
+    Returns a rendering of the cached species/nodes data, produced by
+    render(species_dataframe, nodes_dataframe) and reused until the data is refreshed.
+
+    Args:
+        name (str): Key under which the rendering is cached
+        render (callable): Function building the rendering from the two dataframes
+
+    Returns:
+        The cached or freshly built rendering
+    """
+    species_dataframe, nodes_dataframe = await _get_all_species_cached()
+    version = _species_cache["version"]
+
+    cached = _rendered_tables.get(name)
+    if cached is None or cached[0] != version:
+        # Rendering thousands of rows is CPU-bound, keep it off the event loop
+        loop = asyncio.get_running_loop()
+        rendering = await loop.run_in_executor(EXECUTOR, render, species_dataframe, nodes_dataframe)
+        cached = (version, rendering)
+        _rendered_tables[name] = cached
+    return cached[1]
+
+
+# Line columns whose values repeat across many rows (one value per species or per query)
+REPEATED_LINE_COLUMNS = (
+    'InChIKey',
+    'InChI',
+    'Chemical name',
+    'Stoichiometric formula',
+    'Ordinary structural formula',
+    'queryToken'
+)
+
+
+def _df_to_records(dataframe, extra=None):
+    """
+    Converts a dataframe to a list of dictionaries, one per row, like
+    dataframe.to_dict(orient='records') but pulling each column out once as a list
+    instead of boxing every cell separately.
+
+    Args:
+        dataframe: Dataframe to convert
+        extra (dict, optional): Constant key/value pairs added to every record
+
+    Returns:
+        list: List of dictionaries, one per row
+    """
+    columns = list(dataframe.columns)
+    values = []
+    for position in range(len(columns)):
+        column = dataframe.iloc[:, position]
+        # Plain numeric columns are boxed in bulk straight from their numpy buffer,
+        # everything else (objects, categories, datetimes...) goes through pandas' tolist
+        if column.dtype.kind in 'biuf':
+            values.append(column.to_numpy().tolist())
+        else:
+            values.append(column.tolist())
+
+    if extra:
+        columns.extend(extra)
+        values.extend(repeat(value, len(dataframe)) for value in extra.values())
+
+    return [dict(zip(columns, row)) for row in zip(*values)]
+
+
+def _intern(value):
+    """
+    Interns string values, returning any other value unchanged.
+    """
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+# Shape of a complete standard InChIKey, e.g. UGFAIRIUMAVXCW-UHFFFAOYSA-N
+_INCHIKEY_RE = re.compile(r'[A-Z]{14}-[A-Z]{10}-[A-Z]')
+
+# Maximum number of distinct spectral line queries running or waiting for a worker
+MAX_PENDING_LINES = 32
+
+# Spectral line queries currently running, keyed by their parameters
+_lines_inflight: Dict[tuple, asyncio.Future] = {}
+
+# Number of callers awaiting each of the running spectral line queries
+_lines_waiters: Dict[asyncio.Future, int] = {}
+
+
+async def getLines(lambda_min, lambda_max, listNodes=None, listSpecies=None, progress=None):
     """
     Gets spectral lines data within a specified wavelength range.
 
@@ -95,58 +465,182 @@ async def getLines(lambda_min, lambda_max, listNodes=None, listSpecies=None):
         lambda_max (float): Upper wavelength bound expressed in Angstrom (mandatory)
         listNodes (list, optional): List of tap-endpoints (url) node to filter by
         listSpecies (list, optional): List InchiKeys of species to filter by
+        progress (callable, optional): Coroutine function called with (answered nodes, queried nodes)
+                    each time a node answers. Only the caller starting a query receives its progress,
+                    callers joining an identical query in flight do not.
 
     Returns:
         list: List of dictionaries containing spectral line information
     """
-    # Run the blocking operation in a thread pool
-    loop = asyncio.get_event_loop()
-
-    allSpecies , allNodes = species.getAllSpecies()
-
+    # Drop duplicate filter values so they are neither matched nor keyed twice
     if listNodes is not None:
-        allNodes = filters.filterDataHavingColumnContainingStrings(
-            allNodes,
-            'tapEndpoint',
-            listNodes
-        )
-
+        listNodes = list(dict.fromkeys(listNodes))
     if listSpecies is not None:
-        allSpecies = filters.filterDataHavingColumnContainingStrings(
-            allSpecies,
-            'InChIKey',
-            listSpecies
-        )
+        listSpecies = list(dict.fromkeys(listSpecies))
+
+    # Identical queries already in progress share a single upstream fetch. The filters
+    # select rows regardless of the order they are given in, so they are keyed as sets.
+    key = (
+        lambda_min,
+        lambda_max,
+        frozenset(listNodes) if listNodes is not None else None,
+        frozenset(listSpecies) if listSpecies is not None else None
+    )
 
-    def get_lines_sync():
+    task = _lines_inflight.get(key)
+    if task is None:
+        # Refuse new work rather than queueing it unboundedly in front of the VAMDC nodes
+        if len(_lines_inflight) >= MAX_PENDING_LINES:
+            raise RuntimeError(
+                f"Too many spectral line queries in progress ({len(_lines_inflight)}), please retry later"
+            )
+        task = asyncio.ensure_future(_query_lines(lambda_min, lambda_max, listNodes, listSpecies, progress))
+        _lines_inflight[key] = task
+        task.add_done_callback(lambda _: _lines_inflight.pop(key, None))
+
+    # Shield the shared task so one caller going away does not cancel it for the others
+    _lines_waiters[task] = _lines_waiters.get(task, 0) + 1
+    try:
+        return await asyncio.shield(task)
+    finally:
+        _lines_waiters[task] -= 1
+        if not _lines_waiters[task]:
+            del _lines_waiters[task]
+            # The last caller went away (e.g. an HTTP client timing out): stop the query
+            # rather than let it hold a pending slot and node workers for nobody
+            if not task.done():
+                task.cancel()
+
+
+async def _query_lines(lambda_min, lambda_max, listNodes, listSpecies, progress):
+    """
+    Performs the spectral lines query behind getLines.
+    """
+    # Run the blocking operation in a thread pool
+    loop = asyncio.get_running_loop()
+
+    allSpecies , allNodes = await _get_all_species_cached()
+    tap_index = _species_cache["tap_index"]
+
+    import pyVAMDC.spectral.filters as filters
+
+    # Full endpoints and InChIKeys are matched exactly, through pandas' hashed isin;
+    # partial values fall back to pyVAMDC's substring filter
+    def filter_nodes():
+        if listNodes is None:
+            return allNodes
+        exact = allNodes['tapEndpoint'].isin(listNodes)
+        if allNodes.loc[exact, 'tapEndpoint'].nunique() == len(listNodes):
+            return allNodes[exact]
+        return filters.filterDataHavingColumnContainingStrings(allNodes, 'tapEndpoint', listNodes)
+
+    def filter_species():
+        # Also returns the row positions of the remaining species, per node TAP endpoint
+        if listSpecies is None:
+            return allSpecies, tap_index
+        if all(_INCHIKEY_RE.fullmatch(key) for key in listSpecies):
+            filtered = allSpecies[allSpecies['InChIKey'].isin(listSpecies)]
+        else:
+            filtered = filters.filterDataHavingColumnContainingStrings(allSpecies, 'InChIKey', listSpecies)
+        return filtered, filtered.groupby('tapEndpoint', sort=False).indices
+
+    # The two filters are independent, run them side by side in the worker pool
+    allNodes, (allSpecies, species_by_node) = await asyncio.gather(
+        loop.run_in_executor(EXECUTOR, filter_nodes),
+        loop.run_in_executor(EXECUTOR, filter_species)
+    )
+
+    import pyVAMDC.spectral.lines as lines
+
+    def get_lines_sync(node_dataframe, species_positions):
         return lines.getLines(
             lambda_min,
             lambda_max,
-            allSpecies,
-            allNodes,
+            allSpecies.iloc[species_positions],
+            node_dataframe,
             False
         )
 
-    # Get the result (could be dict of dataframes or single dataframe)
-    result = await loop.run_in_executor(None, get_lines_sync)
-
-    # Check if result is a dictionary of dataframes (multiple databases)
-    if isinstance(result, dict):
-        # Combine all dataframes into a single list of records
-        all_records = []
-        for database_name, dataframe in result.items():
-            # Convert dataframe to records and add database source info
-            records = dataframe.to_dict(orient='records')
-            # Add the database name to each record
-            for record in records:
-                record['source_database'] = database_name
-            all_records.extend(records)
-        return all_records
-    # Check if result is already a list or needs conversion from DataFrame
-    elif hasattr(result, 'to_dict'):
-        return result.to_dict(orient='records')
+    # Query every node in its own node worker, so the total latency follows the slowest node
+    # rather than the sum of all of them. Each node only receives its own species, and
+    # nodes holding none of the requested species are not queried at all.
+    node_tasks = []
+    for position, tap_endpoint in enumerate(allNodes['tapEndpoint']):
+        species_positions = species_by_node.get(tap_endpoint)
+        if species_positions is None:
+            continue
+        node_tasks.append(loop.run_in_executor(
+            NODE_EXECUTOR, get_lines_sync, allNodes.iloc[[position]], species_positions
+        ))
+    if progress is None:
+        node_results = await asyncio.gather(*node_tasks)
     else:
-        return result
+        # Report each node as it answers, so (stdio) clients see the query advancing
+        try:
+            for completed, finished in enumerate(asyncio.as_completed(node_tasks), start=1):
+                await finished
+                try:
+                    await progress(completed, len(node_tasks))
+                except Exception:
+                    # A client that went away must not fail the query shared with others
+                    pass
+        finally:
+            # When a node fails (or the query is cancelled), drop the nodes still queued and
+            # retrieve the other failures, which would otherwise be logged as never retrieved
+            for task in node_tasks:
+                if not task.done():
+                    task.cancel()
+                elif not task.cancelled():
+                    task.exception()
+        node_results = [task.result() for task in node_tasks]
+
+    # Build the records in the worker pool too, keeping the event loop free
+    return await loop.run_in_executor(EXECUTOR, _lines_to_records, node_results)
+
+
+def _lines_to_records(results):
+    """
+    Combines the results of the per-node lines.getLines calls into a list of records.
+
+    Args:
+        results (list): lines.getLines results, each either a dict mapping database names
+            to dataframes, or a single dataframe
+
+    Returns:
+        list: List of dictionaries containing spectral line information
+    """
+    # Each frame is converted on its own: databases return different columns and dtypes,
+    # which a combined frame would merge into NaN-filled keys and float-upcast integers
+    records = []
+    for result in results:
+        # Check if result is a dictionary of dataframes (multiple databases)
+        if isinstance(result, dict):
+            # Add the database name to each record, skipping databases that returned no lines
+            for database_name, dataframe in result.items():
+                if dataframe is not None and not dataframe.empty:
+                    records.extend(_line_frame_to_records(
+                        dataframe, {'source_database': _intern(database_name)}
+                    ))
+        # Check if result is a single DataFrame, whose records carry no database name
+        elif hasattr(result, 'to_dict'):
+            records.extend(_line_frame_to_records(result))
+    return records
+
+
+def _line_frame_to_records(dataframe, extra=None):
+    """
+    Converts a dataframe of spectral lines to a list of records, sharing the string
+    objects of the repeated identifier columns. Constant extra key/value pairs are
+    added to every record.
+    """
+    # Repeated identifiers become categories so records share one string object per value,
+    # interned so they are also shared with the same values held elsewhere in the process
+    repeated = [column for column in REPEATED_LINE_COLUMNS if column in dataframe.columns]
+    dataframe = dataframe.astype({column: 'category' for column in repeated})
+    for column in repeated:
+        dataframe[column] = dataframe[column].cat.rename_categories(_intern)
+
+    return _df_to_records(dataframe, extra)
 
 
 @mcp.tool()
@@ -161,61 +655,54 @@ async def get_server_info() -> Dict[str, Any]:
             - available_tools (List[str]): List of available tool names
             - description (str): Server description
         """
-    return {
-                "server_name": "VAMDC MCP Server",
-                "version": "1.0.0",
-                "available_tools": ["get_server_info", "get_nodes", "get_species", "get_species_by_node", "get_lines"],
-                "description": "Server for accessing VAMDC spectroscopic databases",
-                "endpoints": {
-                "server_info": "Get server information and capabilities",
-                "species": "Get all available chemical species",
-                "nodes": "Get all available database nodes",
-                "species_by_node": "Get chemical species from a specific database node",
-                "lines": "Get spectral lines within wavelength range"
-            }
-    }
+    return SERVER_INFO
 
 
 @mcp.tool()
-async def get_nodes() -> str:
+async def get_nodes(fields: Optional[List[str]] = None) -> str:
     """
     Gets all the Nodes available on the Species Database.
     Returns a markdown table with all node information.
 
+    Args:
+        fields (List[str], optional): Columns to include in the table, among those listed below.
+                    Defaults to all of them.
+                    Example: ["tapEndpoint"]
+
     Returns:
         str: A markdown-formatted table containing all database nodes with columns:
             - shortName: Short name identifier for the database node
             - tapEndpoint: TAP (Table Access Protocol) endpoint URL for the database node
             - topics: List of scientific topics covered by the node
     """
-    nodes = getNodes()
-
-    # Build markdown table
-    table_lines = [
-        "| Short Name | TAP Endpoint | Topics |",
-        "|------------|--------------|--------|"
-    ]
-
-    for node in nodes:
-        short_name = node.get('shortName', '')
-        tap_endpoint = node.get('tapEndpoint', '')
-        topics = ', '.join(node.get('topics', []))
-
-        # Escape pipe characters in cell content
-        short_name = short_name.replace('|', '\\|')
-        tap_endpoint = tap_endpoint.replace('|', '\\|')
-        topics = topics.replace('|', '\\|')
+    if fields is None:
+        return await _render_cached(
+            "nodes",
+            lambda _, nodes_dataframe: format_nodes_as_markdown_table(_df_to_records(nodes_dataframe))
+        )
 
-        table_lines.append(f"| {short_name} | {tap_endpoint} | {topics} |")
+    _check_fields(fields, list(NODE_TABLE_COLUMNS))
+    _, nodes_dataframe = await _get_all_species_cached()
 
-    return "\n".join(table_lines)
+    # Render in the worker pool, like the full table, to keep the event loop free
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        EXECUTOR,
+        lambda: format_nodes_as_markdown_table(_df_to_records(nodes_dataframe), fields)
+    )
 
 @mcp.tool()
-async def get_species(state: str) -> str:
+async def get_species(state: str, fields: Optional[List[str]] = None) -> str:
     """
     Gets all the chemical information available on the Species Database.
     Returns a markdown table with species information.
 
+    Args:
+        fields (List[str], optional): Columns to include in the table, among those listed below.
+                    Defaults to all of them. Requesting only the needed columns (e.g. the InChIKey
+                    to pass to get_lines) keeps the table much smaller.
+                    Example: ["name", "InChIKey"]
+
     Returns:
         str: A markdown-formatted table containing all chemical species with columns:
             - name: Human readable species name
@@ -231,9 +718,21 @@ async def get_species(state: str) -> str:
             - computed charge: Computed charge
             - computed mol_weight: Computed molecular weight
     """
-    species_dataframe, _ = species.getAllSpecies()
-    species_list = species_dataframe.to_dict(orient='records')
-    return format_species_as_markdown_table(species_list)
+    if fields is None:
+        # Built from the cells escaped once per cache refresh, rather than from the dataframe
+        return await _render_cached(
+            "species",
+            lambda *_: _species_table_from_cells(_species_cache["species_cells"])
+        )
+
+    _check_fields(fields, SPECIES_TABLE_COLUMNS)
+    await _get_all_species_cached()
+    species_cells = _species_cache["species_cells"]
+
+    # Project the already escaped cells onto the requested columns
+    selected = [species_cells[SPECIES_TABLE_COLUMNS.index(field)] for field in fields]
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(EXECUTOR, _species_table_from_cells, selected, fields)
 
 
 @mcp.tool()
@@ -250,20 +749,23 @@ async def get_species_by_node(node_url: str) -> str:
         str: A markdown-formatted table containing species information from the specified node,
         with the same columns as get_species but filtered to the specific database node.
     """
+    await _get_all_species_cached()
+    tap_index = _species_cache["tap_index"]
+    species_cells = _species_cache["species_cells"]
+
     # Run the blocking operation in a thread pool
-    loop = asyncio.get_event_loop()
+    loop = asyncio.get_running_loop()
 
     def get_species_by_node_sync():
-        # Query the specific node by filtering all species for this node's TAP endpoint
-        all_species_df, _ = species.getAllSpecies()
-
-        # Filter species to only those from the specified node
-        node_species_df = all_species_df[all_species_df['tapEndpoint'] == node_url]
+        # Gather the already escaped cells of the specified node's species
+        # through the prebuilt endpoint index
+        positions = tap_index.get(node_url)
+        if positions is None:
+            positions = []
 
-        return node_species_df.to_dict(orient='records')
+        return _species_table_from_cells([column[positions] for column in species_cells])
 
-    species_list = await loop.run_in_executor(None, get_species_by_node_sync)
-    return format_species_as_markdown_table(species_list)
+    return await loop.run_in_executor(EXECUTOR, get_species_by_node_sync)
 
 
 @mcp.tool()
@@ -271,7 +773,8 @@ async def get_lines(
             lambda_min: float,
             lambda_max: float,
             listNodes: Optional[List[str]] = None,
-            listSpecies: Optional[List[str]] = None
+            listSpecies: Optional[List[str]] = None,
+            ctx: Context = None
         ) -> List[Dict[str, Any]]:
     """
             Gets spectral lines data within a specified wavelength range.
@@ -308,7 +811,18 @@ async def get_lines(
             Example:
                 await get_lines(4000.0, 5000.0, listSpecies=["UGFAIRIUMAVXCW-UHFFFAOYSA-N"])
             """
-    return await getLines(lambda_min, lambda_max, listNodes, listSpecies)
+    # Reject unusable wavelength windows up front instead of querying every node for nothing
+    # (written so that NaN bounds, which compare false, are rejected too)
+    if not (0 <= lambda_min < lambda_max < math.inf):
+        raise ValueError(
+            f"Invalid wavelength range [{lambda_min}, {lambda_max}]: "
+            "lambda_min must be non-negative and lower than lambda_max, which must be finite"
+        )
+
+    # Progress notifications only reach stdio clients: the HTTP transport answers with a
+    # single JSON body (json_response=True), which drops notifications sent meanwhile
+    progress = ctx.report_progress if ctx is not None else None
+    return await getLines(lambda_min, lambda_max, listNodes, listSpecies, progress)
 
 
 if __name__ == "__main__":
@@ -326,14 +840,77 @@ if __name__ == "__main__":
         default=8888,
         help="Port to listen on (only used with --transport http)"
     )
+    parser.add_argument(
+        "--keep-alive",
+        type=int,
+        default=30,
+        help="Seconds an idle HTTP connection is kept open for reuse (only used with --transport http)"
+    )
+    parser.add_argument(
+        "--cache-ttl",
+        type=float,
+        default=SPECIES_CACHE_TTL,
+        help="Seconds to reuse the species/nodes metadata before refetching it (send SIGHUP to refresh immediately)"
+    )
+    parser.add_argument(
+        "--threads",
+        type=int,
+        default=DEFAULT_THREADS,
+        help="Number of worker threads running the per-node spectral line queries"
+    )
+    parser.add_argument(
+        "--max-pending-lines",
+        type=int,
+        default=MAX_PENDING_LINES,
+        help="Maximum number of distinct get_lines queries accepted at once; further ones are rejected until some complete"
+    )
     args = parser.parse_args()
 
+    if args.threads != DEFAULT_THREADS:
+        NODE_EXECUTOR.shutdown(wait=False)
+        NODE_EXECUTOR = ThreadPoolExecutor(max_workers=args.threads, thread_name_prefix="vamdc-node")
+    SPECIES_CACHE_TTL = args.cache_ttl
+    MAX_PENDING_LINES = args.max_pending_lines
+    if hasattr(signal, "SIGHUP"):
+        signal.signal(signal.SIGHUP, _invalidate_species_cache)
+
     if args.transport == "http":
         # Start the server with Streamable HTTP transport
         print(f"Starting VAMDC MCP server with HTTP transport on http://localhost:{args.port}/mcp")
-        uvicorn.run(mcp.streamable_http_app, host="localhost", port=args.port)
+        import uvicorn
+        from starlette.middleware.gzip import GZipMiddleware
+
+        # Fetch the species metadata before accepting requests, so the first call does not wait for it
+        asyncio.run(_warm_species_cache())
+
+        app = mcp.streamable_http_app()
+        # Gzip large responses (e.g. get_lines results) for clients accepting it
+        app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=1)
+        # uvicorn's default loop setting picks uvloop whenever it is installed
+        try:
+            uvicorn.run(app, host="localhost", port=args.port, timeout_keep_alive=args.keep_alive)
+        finally:
+            _shutdown_executors()
     else:
         # Start the server with stdio transport (log to stderr to avoid interfering with JSON-RPC)
-        import sys
         print("Starting VAMDC MCP server with stdio transport", file=sys.stderr, flush=True)
-        asyncio.run(mcp.run_stdio_async())
+        # Prefer uvloop's event loop where available (it is not on Windows)
+        try:
+            import uvloop
+            loop_factory = uvloop.new_event_loop
+        except ImportError:
+            loop_factory = None
+
+        async def run_stdio():
+            # Fetch the species metadata in the background while the client initializes,
+            # and stop waiting for it once the client has gone
+            warm_up = asyncio.create_task(_warm_species_cache())
+            try:
+                await mcp.run_stdio_async()
+            finally:
+                warm_up.cancel()
+
+        try:
+            asyncio.run(run_stdio(), loop_factory=loop_factory)
+        finally:
+            _shutdown_executors()
@@ -0,0 +1,27 @@
+import pytest
+
+pd = pytest.importorskip("pandas")
+pytest.importorskip("mcp")
+
+import server
+
+
+def test_species_table_renders_missing_values():
+    species = pd.DataFrame({
+        'name': ['Water', 'Carbon|monoxide'],
+        'InChIKey': ['XLYOFNOQVPJJNP-UHFFFAOYSA-N', 'UGFAIRIUMAVXCW-UHFFFAOYSA-N'],
+        'structuralFormula': ['H2O', None],
+        'charge': [0.0, float('nan')]
+    })
+
+    rows = server.format_species_as_markdown_table(species).split('\n')
+
+    assert len(rows) == 4
+    assert rows[2].startswith('| Water | ')
+    assert rows[3].startswith('| Carbon\\|monoxide | ')
+    cells = rows[3].strip('| ').split(' | ')
+    columns = server.SPECIES_TABLE_COLUMNS
+    assert cells[columns.index('structuralFormula')] == 'None'
+    assert cells[columns.index('charge')] == 'nan'
+    # Columns absent from the dataframe render empty
+    assert rows[3].endswith('|  |  |  |  |')